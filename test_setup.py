@@ -3,6 +3,21 @@
 Test script to verify that all dependencies are properly installed
 """
 
+import functools
+import os
+import shutil
+
+# Marker recording the ffmpeg binary that last passed the check
+FFMPEG_MARKER = os.path.join(os.path.expanduser("~"), ".cache", "transcribe", "ffmpeg_ok")
+
+
+def _ffmpeg_signature():
+    """Return '<path>:<mtime>' for the ffmpeg on PATH, or None if it is missing"""
+    ffmpeg_path = shutil.which('ffmpeg')
+    if not ffmpeg_path:
+        return None
+    return f"{ffmpeg_path}:{os.stat(ffmpeg_path).st_mtime}"
+
 def test_imports():
     """Test if all required packages can be imported"""
     print("Testing package imports...")
@@ -22,10 +37,10 @@ def test_imports():
         return False
     
     try:
-        from pydub import AudioSegment
-        print("✓ pydub imported successfully")
+        from faster_whisper import WhisperModel
+        print("✓ faster-whisper imported successfully")
     except ImportError as e:
-        print(f"✗ Failed to import pydub: {e}")
+        print(f"✗ Failed to import faster-whisper: {e}")
         return False
     
     try:
@@ -44,16 +59,34 @@ def test_imports():
     
     return True
 
+@functools.lru_cache(maxsize=1)
 def test_ffmpeg():
     """Test if ffmpeg is available"""
     print("\nTesting FFmpeg availability...")
     
+    # Skip spawning ffmpeg if this exact binary already passed
+    signature = _ffmpeg_signature()
+    try:
+        with open(FFMPEG_MARKER, 'r', encoding='utf-8') as f:
+            if signature and f.read() == signature:
+                print("✓ FFmpeg is available (cached)")
+                return True
+    except OSError:
+        pass
+    
     import subprocess
     try:
         result = subprocess.run(['ffmpeg', '-version'], 
                               capture_output=True, text=True, timeout=10)
         if result.returncode == 0:
             print("✓ FFmpeg is available")
+            if signature:
+                try:
+                    os.makedirs(os.path.dirname(FFMPEG_MARKER), exist_ok=True)
+                    with open(FFMPEG_MARKER, 'w', encoding='utf-8') as f:
+                        f.write(signature)
+                except OSError:
+                    pass
             return True
         else:
             print("✗ FFmpeg is not working properly")
@@ -1,9 +1,10 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
 import threading
+import queue
 import os
 from datetime import datetime
-from transcriber_core import YouTubeTranscriber
+from transcriber_core import YouTubeTranscriber, save_transcription, transcribe_remote
 
 class TranscriberApp:
     def __init__(self, root):
@@ -12,10 +13,18 @@ class TranscriberApp:
         self.root.geometry("800x600")
         self.root.configure(bg='#f0f0f0')
         
-        # Initialize core transcriber
-        self.transcriber = YouTubeTranscriber()
+        # Initialize core transcriber, unless jobs go to a running transcriber_server
+        self.model_size = "base"
+        self.server_url = os.environ.get('TRANSCRIBER_SERVER')
+        self.transcriber = None if self.server_url else YouTubeTranscriber(model_size=self.model_size)
         self.is_transcribing = False
         
+        # Messages from the worker thread, drained on the Tk main thread
+        self.ui_queue = queue.SimpleQueue()
+        
+        # Segment texts of the current transcription, replayed to disk on save
+        self.transcription_segments = []
+        
         self.setup_ui()
         
     def setup_ui(self):
@@ -80,30 +89,72 @@ class TranscriberApp:
         self.progress.start()
         self.status_label.config(text="Starting transcription...")
         
+        self.text_area.delete(1.0, tk.END)
+        self.transcription_segments = []
+        
         # Start transcription in a separate thread
         thread = threading.Thread(target=self.transcribe_video, args=(url,))
         thread.daemon = True
         thread.start()
         
+        self.root.after(50, self.drain_ui_queue)
+        
     def transcribe_video(self, url):
+        # Runs on the worker thread: never touch Tk widgets here, only queue messages
         try:
-            # Progress callback function
-            def progress_callback(message):
-                self.root.after(0, lambda: self.status_label.config(text=message))
-            
-            # Use the core transcriber
-            result = self.transcriber.transcribe_youtube_url(url, progress_callback)
+            if self.server_url:
+                # The server returns the whole transcription at once; queue it as one
+                # segment so it is kept for saving like streamed segments are
+                self.ui_queue.put(f"Transcribing on {self.server_url}...")
+                result = transcribe_remote(self.server_url, url, self.model_size)
+                if result['success']:
+                    self.ui_queue.put({"type": "transcription_segment", "segment_number": 1,
+                                       "text": result['transcription']})
+            else:
+                # Use the core transcriber
+                result = self.transcriber.transcribe_youtube_url(url, self.ui_queue.put)
             
-            # Update UI based on result
             if result['success']:
-                self.root.after(0, lambda: self.update_transcription_result(result['transcription']))
+                self.ui_queue.put({"type": "transcription_complete", "transcription": result['transcription']})
             else:
-                self.root.after(0, lambda: self.handle_transcription_error(result['error']))
+                self.ui_queue.put({"type": "error", "message": result['error']})
                 
         except Exception as e:
-            self.root.after(0, lambda: self.handle_transcription_error(str(e)))
+            self.ui_queue.put({"type": "error", "message": str(e)})
             
-    
+    def drain_ui_queue(self):
+        """Apply pending worker messages to the UI (runs on the Tk main thread)."""
+        # Coalesce everything that arrived since the last poll into one insert and one status update
+        segment_texts = []
+        status = None
+        final_message = None
+        while final_message is None:
+            try:
+                message = self.ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            
+            if isinstance(message, str):
+                status = message
+            elif message.get("type") == "transcription_segment":
+                segment_texts.append(message["text"])
+                status = f"Transcribing... segment {message['segment_number']}"
+            elif message.get("type") in ("transcription_complete", "error"):
+                final_message = message
+        
+        if segment_texts:
+            self.transcription_segments.extend(segment_texts)
+            self.text_area.insert(tk.END, " ".join(segment_texts) + " ")
+            self.text_area.see(tk.END)
+        if status is not None:
+            self.status_label.config(text=status)
+        
+        if final_message is None:
+            self.root.after(50, self.drain_ui_queue)
+        elif final_message["type"] == "transcription_complete":
+            self.update_transcription_result(final_message["transcription"])
+        else:
+            self.handle_transcription_error(final_message["message"])
                 
     def update_transcription_result(self, transcription):
         self.text_area.delete(1.0, tk.END)
@@ -123,8 +174,7 @@ class TranscriberApp:
         messagebox.showerror("Transcription Error", error_msg)
         
     def save_transcription(self):
-        transcription = self.text_area.get(1.0, tk.END).strip()
-        if not transcription:
+        if not self.transcription_segments:
             messagebox.showwarning("Warning", "No transcription to save")
             return
         
@@ -153,14 +203,14 @@ class TranscriberApp:
             # Fallback for Docker environment
             file_path = default_path
             
-        # Use the core transcriber's save method
-        if self.transcriber.save_transcription(transcription, file_path):
+        if save_transcription(self.transcription_segments, file_path):
             messagebox.showinfo("Success", f"Transcription saved to {file_path}")
         else:
             messagebox.showerror("Error", "Failed to save transcription")
                 
     def clear_text(self):
         self.text_area.delete(1.0, tk.END)
+        self.transcription_segments = []
         self.url_entry.delete(0, tk.END)
         self.status_label.config(text="Ready to transcribe")
         self.save_btn.config(state='disabled')
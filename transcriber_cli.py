@@ -5,61 +5,208 @@ Uses the core YouTubeTranscriber class.
 """
 
 import argparse
+import logging
+import os
+import queue
 import sys
-from transcriber_core import YouTubeTranscriber
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from transcriber_core import (YouTubeTranscriber, DEFAULT_CACHE_DIR, save_transcription,
+                              transcribe_remote)
+
+
+def prefetch_downloads(transcriber: YouTubeTranscriber, urls: list, max_workers: int = 4,
+                       max_ready: int = 2):
+    """
+    Download audio for several URLs on a thread pool and yield (url, downloaded)
+    pairs as they finish. At most max_ready downloads wait for the consumer.
+    """
+    ready = queue.Queue(maxsize=max_ready)
+    stopped = threading.Event()
+    
+    def fetch(url):
+        # Invalid and cached URLs are left to transcribe_youtube_url to handle
+        downloaded = None
+        if transcriber._is_valid_youtube_url(url) and not transcriber.is_cached(url):
+            try:
+                downloaded = transcriber.download_audio(url)
+            except Exception as e:
+                print(f"Download of {url} failed: {e}")
+                downloaded = (None, {})
+        # Wait for room, giving up if the consumer has stopped
+        while not stopped.is_set():
+            try:
+                ready.put((url, downloaded), timeout=0.5)
+                return
+            except queue.Full:
+                continue
+        if downloaded and downloaded[0]:
+            transcriber._cleanup_temp_files([downloaded[0]])
+    
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        for url in urls:
+            pool.submit(fetch, url)
+        for _ in urls:
+            yield ready.get()
+    finally:
+        # Runs on exhaustion and when the consumer stops early (exception, Ctrl-C)
+        stopped.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+        while True:
+            try:
+                _, downloaded = ready.get_nowait()
+            except queue.Empty:
+                break
+            if downloaded and downloaded[0]:
+                transcriber._cleanup_temp_files([downloaded[0]])
+
+
+def transcribe_url(transcriber: Optional[YouTubeTranscriber], url: str, output_path: str,
+                   model_size: str, progress_callback, server_url: Optional[str] = None,
+                   downloaded=None) -> bool:
+    """
+    Transcribe one URL into output_path. Returns True on success.
+    With server_url set the job runs remotely and transcriber may be None.
+    """
+    print(f"Starting transcription of: {url}")
+    print(f"Using Whisper model: {model_size}")
+    print("-" * 50)
+    
+    # Transcribe, using the warm worker if one is configured
+    if server_url:
+        print(f"Using transcription server: {server_url}")
+        result = transcribe_remote(server_url, url, model_size)
+        saved = result['success'] and save_transcription(result['transcription'], output_path)
+    else:
+        # Stream segments into a temp file beside the output as they are transcribed,
+        # and only replace the output once the run succeeds
+        tmp_path = None
+        try:
+            output_dir = os.path.dirname(output_path)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=output_dir or '.', suffix='.tmp',
+                                            prefix=os.path.basename(output_path) + '.')
+            with os.fdopen(fd, 'w', encoding='utf-8') as sink:
+                result = transcriber.transcribe_youtube_url(url, progress_callback, sink=sink,
+                                                            downloaded=downloaded)
+            if result['success']:
+                os.replace(tmp_path, output_path)
+                tmp_path = None
+            saved = True
+        except OSError as e:
+            print(f"\n❌ Failed to save transcription to: {output_path} ({e})")
+            return False
+        finally:
+            if tmp_path:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+    
+    if result['success']:
+        print("\n✅ Transcription completed successfully!")
+        print("-" * 50)
+        print(result['transcription'])
+        print("-" * 50)
+        
+        if saved:
+            print(f"✅ Transcription saved to: {output_path}")
+            return True
+        print(f"❌ Failed to save transcription to: {output_path}")
+        return False
+    
+    print(f"\n❌ Transcription failed: {result['error']}")
+    return False
 
 
 def main():
     parser = argparse.ArgumentParser(description='Transcribe YouTube videos using Whisper')
-    parser.add_argument('url', help='YouTube video URL')
-    parser.add_argument('-o', '--output', help='Output file path (optional)')
+    parser.add_argument('urls', nargs='+', metavar='url', help='YouTube video URL(s)')
+    parser.add_argument('-o', '--output', help='Output file path (optional, single URL only)')
     parser.add_argument('-m', '--model', default='base', 
                        choices=['tiny', 'base', 'small', 'medium', 'large'],
                        help='Whisper model size (default: base)')
+    parser.add_argument('-d', '--device', default='auto', choices=['auto', 'cpu', 'cuda'],
+                       help='Inference device (default: auto, uses CUDA when available)')
+    parser.add_argument('-b', '--beam', type=int, default=1,
+                       help='Decoder beam size (default: 1, greedy; use 5 for a slower final pass)')
+    parser.add_argument('-t', '--threads', type=int,
+                       help='CPU inference threads (default: number of physical cores)')
+    parser.add_argument('-j', '--workers', type=int,
+                       help='Worker processes for videos over 30 minutes (default: one per 4 threads)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Ignore and do not write cached transcriptions')
     parser.add_argument('-v', '--verbose', action='store_true', 
                        help='Verbose output')
     
     args = parser.parse_args()
     
-    # Initialize transcriber
-    transcriber = YouTubeTranscriber(model_size=args.model)
+    if args.beam < 1:
+        parser.error("-b/--beam must be at least 1")
+    if args.threads is not None and args.threads < 1:
+        parser.error("-t/--threads must be at least 1")
+    if args.workers is not None and args.workers < 1:
+        parser.error("-j/--workers must be at least 1")
+    if args.output and len(args.urls) > 1:
+        parser.error("-o/--output can only be used with a single URL")
+    
+    # The server uses its own transcriber settings, so local-only options would be ignored
+    server_url = os.environ.get('TRANSCRIBER_SERVER')
+    if server_url:
+        local_only = [flag for flag, is_set in (
+            ('-d/--device', args.device != 'auto'),
+            ('-b/--beam', args.beam != 1),
+            ('-t/--threads', args.threads is not None),
+            ('-j/--workers', args.workers is not None),
+            ('--no-cache', args.no_cache),
+        ) if is_set]
+        if local_only:
+            parser.error(f"{', '.join(local_only)} cannot be used with TRANSCRIBER_SERVER set")
+    
+    # Per-segment debug output from the core is only shown with -v
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING,
+                        format='[%(levelname)s] %(message)s')
+    
+    # Initialize transcriber once so the model is loaded once for all URLs;
+    # the server has its own, so none is needed locally in that case
+    transcriber = None
+    if not server_url:
+        transcriber = YouTubeTranscriber(model_size=args.model, device=args.device,
+                                         cache_dir=None if args.no_cache else DEFAULT_CACHE_DIR,
+                                         beam_size=args.beam, parallel_workers=args.workers,
+                                         cpu_threads=args.threads)
     
     def progress_callback(message):
         if args.verbose:
             print(f"[INFO] {message}")
     
-    print(f"Starting transcription of: {args.url}")
-    print(f"Using Whisper model: {args.model}")
-    print("-" * 50)
+    # For batches, download ahead on a thread pool while this thread runs inference
+    if len(args.urls) > 1 and not server_url:
+        jobs = prefetch_downloads(transcriber, args.urls)
+    else:
+        jobs = ((url, None) for url in args.urls)
     
-    # Transcribe
-    result = transcriber.transcribe_youtube_url(args.url, progress_callback)
+    failed = 0
+    try:
+        for url, downloaded in jobs:
+            # Save to the given file, or to a default name derived from the video id
+            output_path = args.output or f"transcription_{url.split('v=')[-1]}.txt"
+            if not transcribe_url(transcriber, url, output_path, args.model, progress_callback,
+                                  server_url, downloaded):
+                failed += 1
+    finally:
+        # Stops pending prefetches if the batch is interrupted
+        jobs.close()
     
-    if result['success']:
-        print("\n✅ Transcription completed successfully!")
-        print("-" * 50)
-        print(result['transcription'])
-        print("-" * 50)
-        
-        # Save to file if specified
-        if args.output:
-            if transcriber.save_transcription(result['transcription'], args.output):
-                print(f"✅ Transcription saved to: {args.output}")
-            else:
-                print(f"❌ Failed to save transcription to: {args.output}")
-                sys.exit(1)
-        else:
-            # Save with default name
-            default_filename = f"transcription_{args.url.split('v=')[-1]}.txt"
-            if transcriber.save_transcription(result['transcription'], default_filename):
-                print(f"✅ Transcription saved to: {default_filename}")
-            else:
-                print(f"❌ Failed to save transcription to: {default_filename}")
-                sys.exit(1)
-    else:
-        print(f"\n❌ Transcription failed: {result['error']}")
+    if len(args.urls) > 1:
+        print(f"\nTranscribed {len(args.urls) - failed}/{len(args.urls)} videos")
+    
+    if failed:
         sys.exit(1)
 
-
 if __name__ == "__main__":
     main() 
\ No newline at end of file
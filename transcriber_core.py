@@ -1,10 +1,167 @@
+import contextlib
+import atexit
+import copy
+import json
+import logging
+import multiprocessing
 import os
+import shutil
+import subprocess
 import tempfile
+import threading
+import psutil
+import requests
+
+# Hyperthreads share FMA units, so size OpenMP to physical cores before CTranslate2 loads
+PHYSICAL_CORES = psutil.cpu_count(logical=False) or os.cpu_count() or 1
+os.environ.setdefault("OMP_NUM_THREADS", str(PHYSICAL_CORES))
+
+import numpy as np
 import yt_dlp
-import whisper
-from pydub import AudioSegment
+import ctranslate2
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from faster_whisper import WhisperModel, decode_audio
+from faster_whisper.vad import VadOptions, get_speech_timestamps
 import re
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, Iterator, List, TextIO, Tuple, Union
+
+
+logger = logging.getLogger(__name__)
+
+# Matches YouTube watch/embed/short URLs; group 1 is the 11-character video id
+YOUTUBE_URL_RE = re.compile(
+    r'(?:https?://)?(?:www\.)?'
+    r'(?:youtube|youtu|youtube-nocookie)\.(?:com|be)/'
+    r'(?:watch\?v=|embed/|v/|.+\?v=)?([^&=%?]{11})')
+
+# Audio longer than this is split on silences and transcribed by several processes
+LONG_AUDIO_SECONDS = 30 * 60
+CHUNK_TARGET_SECONDS = 120
+CHUNK_WORKER_THREADS = 4
+SAMPLE_RATE = 16000
+MIN_SILENCE_MS = 500
+
+# Finished transcriptions are cached here as <video id>.<model>.json
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "transcribe")
+
+
+def load_audio(path: str, sampling_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Decode any ffmpeg-readable file to mono float32 samples in [-1, 1) with one ffmpeg pipe."""
+    result = subprocess.run(
+        ['ffmpeg', '-nostdin', '-i', path,
+         '-f', 's16le', '-ac', '1', '-ar', str(sampling_rate), '-'],
+        capture_output=True, check=True
+    )
+    return np.frombuffer(result.stdout, np.int16).astype(np.float32) / 32768.0
+
+
+def _transcribe_options(beam_size: int) -> Dict[str, Any]:
+    """Keyword arguments for WhisperModel.transcribe shared by all code paths."""
+    return dict(
+        language="en",  # Specify language for better accuracy
+        vad_filter=True,  # Skip silent regions so they never reach the encoder
+        vad_parameters=dict(min_silence_duration_ms=MIN_SILENCE_MS),
+        word_timestamps=True,  # Get word-level timestamps for streaming
+        beam_size=beam_size,
+        best_of=1,
+        temperature=0.0  # No sampling fallback passes
+    )
+
+
+def _split_on_silence(audio) -> List[Tuple[int, int]]:
+    """Split 16 kHz audio into ~CHUNK_TARGET_SECONDS (start, end) sample ranges cut mid-silence."""
+    target = CHUNK_TARGET_SECONDS * SAMPLE_RATE
+    speech = get_speech_timestamps(audio, VadOptions(min_silence_duration_ms=MIN_SILENCE_MS))
+    
+    chunks = []
+    chunk_start = 0
+    previous_end = 0
+    for region in speech:
+        if region['start'] - chunk_start >= target:
+            cut = (previous_end + region['start']) // 2
+            if cut > chunk_start:
+                chunks.append((chunk_start, cut))
+                chunk_start = cut
+        previous_end = region['end']
+    chunks.append((chunk_start, len(audio)))
+    return chunks
+
+
+# Model held by each chunk worker process, loaded once by _init_chunk_worker
+_worker_model = None
+
+
+def _init_chunk_worker(model_size: str, device: str, compute_type: str, cpu_threads: int):
+    global _worker_model
+    _worker_model = WhisperModel(model_size, device=device, compute_type=compute_type,
+                                 cpu_threads=cpu_threads)
+
+
+def _transcribe_chunk(audio, offset: float, beam_size: int) -> List[Tuple[str, float, float]]:
+    """Transcribe one chunk in a worker process, shifting timestamps by the chunk offset."""
+    segments, _ = _worker_model.transcribe(audio, **_transcribe_options(beam_size))
+    return [(segment.text, segment.start + offset, segment.end + offset) for segment in segments]
+
+
+def save_transcription(segments_iter: Union[str, Iterable[str]], file_path: str) -> bool:
+    """
+    Save transcription to a file.
+
+    Args:
+        segments_iter: The transcription text, or an iterable of segment texts
+            written one at a time as they are produced
+        file_path: Path where to save the file
+
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        # Create directory if it doesn't exist
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if isinstance(segments_iter, str):
+            segments_iter = [segments_iter]
+
+        # Encode once per segment into a 1 MB binary buffer, bypassing the text layer
+        with open(file_path, 'wb', buffering=1 << 20) as f:
+            for i, segment_text in enumerate(segments_iter):
+                if i:
+                    f.write(b" ")
+                f.write(segment_text.encode('utf-8'))
+
+        print(f"Transcription saved to: {file_path}")
+        return True
+
+    except Exception as e:
+        print(f"Error saving transcription: {e}")
+        return False
+
+
+# Seconds to wait for the server to connect, and for a whole transcription to come back
+SERVER_CONNECT_TIMEOUT = 10
+SERVER_READ_TIMEOUT = float(os.environ.get('TRANSCRIBER_SERVER_TIMEOUT', '3600'))
+
+
+def transcribe_remote(server_url: str, url: str, model_size: str) -> dict:
+    """Send a transcription job to a running transcriber_server worker."""
+    try:
+        response = requests.post(
+            f"{server_url.rstrip('/')}/transcribe",
+            json={'url': url, 'model': model_size},
+            timeout=(SERVER_CONNECT_TIMEOUT, SERVER_READ_TIMEOUT)
+        )
+        response.raise_for_status()
+        return response.json()
+    except (requests.RequestException, ValueError) as e:
+        # ValueError covers a response body that is not JSON
+        return {
+            'success': False,
+            'error': f"Transcription server error: {e}",
+            'transcription': None
+        }
 
 
 class YouTubeTranscriber:
@@ -13,28 +170,66 @@ class YouTubeTranscriber:
     Can be used independently of any UI framework.
     """
     
-    def __init__(self, model_size: str = "base"):
+    def __init__(self, model_size: str = "base", compute_type: Optional[str] = None,
+                 cpu_threads: Optional[int] = None, device: Optional[str] = None,
+                 cache_dir: Optional[str] = DEFAULT_CACHE_DIR, beam_size: int = 1,
+                 parallel_workers: Optional[int] = None):
         """
         Initialize the transcriber.
         
         Args:
             model_size: Whisper model size ('tiny', 'base', 'small', 'medium', 'large')
+            compute_type: CTranslate2 compute type (default: 'int8' on CPU, 'float16' on GPU)
+            cpu_threads: Number of CPU threads used for inference (default: physical cores)
+            device: 'cpu' or 'cuda' (default: 'cuda' when a CUDA device is present)
+            cache_dir: Directory for cached results keyed by video id (None disables caching)
+            beam_size: Decoder beam width (1 = greedy draft, higher for a slower final pass)
+            parallel_workers: Worker processes for audio over 30 minutes
+                (default: one per 4 inference threads, 1 on GPU; 1 disables chunking)
         """
         self.whisper_model = None
         self.model_size = model_size
+        # Jobs currently running on whisper_model; a model switch waits for them to finish
+        self._model_cv = threading.Condition()
+        self._model_users = 0
+        # Size a queued switch is waiting to load; new jobs for other sizes wait behind it
+        self._pending_size: Optional[str] = None
+        # Worker processes for long audio, kept across jobs for the current model size
+        self._chunk_pool: Optional[ProcessPoolExecutor] = None
+        self._chunk_pool_lock = threading.Lock()
+        atexit.register(self._shutdown_chunk_pool)
+        if device is None or device == "auto":
+            device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+        self.device = device
+        if compute_type is None:
+            compute_type = "float16" if self.device == "cuda" else "int8"
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads or PHYSICAL_CORES
+        self.cache_dir = cache_dir
+        self.beam_size = beam_size
+        self.parallel_workers = parallel_workers
         self.temp_files = []
+        # Downloads go to their own subdirectory of this per-instance directory, so
+        # concurrent downloads of the same video never share a file
+        self.download_dir = tempfile.mkdtemp(prefix='transcribe-')
+        atexit.register(shutil.rmtree, self.download_dir, ignore_errors=True)
         
-    def transcribe_youtube_url(self, url: str, progress_callback=None) -> Dict[str, Any]:
+    def transcribe_youtube_url(self, url: str, progress_callback=None,
+                               sink: Optional[TextIO] = None,
+                               downloaded: Optional[Tuple[Optional[str], Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         Transcribe a YouTube video from its URL.
         
         Args:
             url: YouTube video URL
             progress_callback: Optional callback function for progress updates
+            sink: Optional text file handle that each segment is written to as it arrives
+            downloaded: Optional result of download_audio() for this URL; skips the download step
             
         Returns:
             Dictionary containing transcription result and metadata
         """
+        audio_path = None
         try:
             # Validate URL
             if not self._is_valid_youtube_url(url):
@@ -44,11 +239,31 @@ class YouTubeTranscriber:
                     'transcription': None
                 }
             
-            # Download audio
-            if progress_callback:
-                progress_callback("Downloading audio...")
+            # Return a previous result for this video and model if there is one
+            cached = self._load_cached_result(url)
+            if cached is not None:
+                if downloaded is not None and downloaded[0]:
+                    self._cleanup_temp_files([downloaded[0]])
+                return self._replay_cached_result(cached, progress_callback, sink)
+            
+            # Record segments so the finished result can be cached with them
+            segments = []
+            
+            def record_segments(message):
+                if isinstance(message, dict) and message.get("type") == "transcription_segment":
+                    segments.append(message)
+                if progress_callback:
+                    progress_callback(message)
+            
+            # Download audio, unless it was already fetched ahead of time
+            if downloaded is not None:
+                audio_path, self.video_info = downloaded
+            else:
+                if progress_callback:
+                    progress_callback("Downloading audio...")
+                
+                audio_path = self._download_audio(url)
             
-            audio_path = self._download_audio(url)
             if not audio_path:
                 return {
                     'success': False,
@@ -56,38 +271,34 @@ class YouTubeTranscriber:
                     'transcription': None
                 }
             
-            # Convert to WAV (or use original if too large)
+            # Decode to the 16 kHz mono samples Whisper expects in a single ffmpeg pass
             if progress_callback:
                 progress_callback("Processing audio...")
             
-            processed_audio_path = self._convert_to_wav(audio_path)
-            if not processed_audio_path:
-                return {
-                    'success': False,
-                    'error': 'Failed to process audio',
-                    'transcription': None
-                }
+            audio = self._load_audio(audio_path)
+            if isinstance(audio, np.ndarray):
+                # The samples are in memory, the download is no longer needed
+                self._cleanup_temp_files([audio_path])
             
             # Transcribe with Whisper
             if progress_callback:
                 progress_callback("Transcribing with Whisper...")
             
-            transcription = self._transcribe_audio(processed_audio_path, progress_callback)
+            transcription = self._transcribe_audio(audio, record_segments, sink)
             
             # Clean up temporary files
-            files_to_clean = [audio_path]
-            if processed_audio_path != audio_path:
-                files_to_clean.append(processed_audio_path)
-            self._cleanup_temp_files(files_to_clean)
+            self._cleanup_temp_files([audio_path])
             
             if transcription and transcription.strip():
-                return {
+                result = {
                     'success': True,
                     'transcription': transcription.strip(),
                     'url': url,
                     'model_used': self.model_size,
                     'video_info': getattr(self, 'video_info', {})
                 }
+                self._store_cached_result(url, result, segments)
+                return result
             else:
                 return {
                     'success': False,
@@ -96,8 +307,9 @@ class YouTubeTranscriber:
                 }
                 
         except Exception as e:
-            # Clean up any temporary files
-            self._cleanup_temp_files()
+            # Clean up this job's temporary files, leaving other pending downloads alone
+            if audio_path:
+                self._cleanup_temp_files([audio_path])
             return {
                 'success': False,
                 'error': str(e),
@@ -106,28 +318,89 @@ class YouTubeTranscriber:
     
     def _is_valid_youtube_url(self, url: str) -> bool:
         """Check if the URL is a valid YouTube URL."""
-        youtube_regex = (
-            r'(https?://)?(www\.)?'
-            '(youtube|youtu|youtube-nocookie)\.(com|be)/'
-            '(watch\?v=|embed/|v/|.+\?v=)?([^&=%\?]{11})')
-        return bool(re.match(youtube_regex, url))
+        return YOUTUBE_URL_RE.match(url) is not None
+    
+    def _cache_path(self, url: str) -> Optional[str]:
+        """Return the cache file for this URL and the current model, or None if caching is off."""
+        match = YOUTUBE_URL_RE.match(url)
+        if not self.cache_dir or match is None:
+            return None
+        # Wider-beam passes are cached separately from greedy drafts
+        beam_suffix = f".b{self.beam_size}" if self.beam_size > 1 else ""
+        return os.path.join(self.cache_dir, f"{match.group(1)}.{self.model_size}{beam_suffix}.json")
+    
+    def is_cached(self, url: str) -> bool:
+        """Check if a transcription of this URL with the current model is cached."""
+        cache_path = self._cache_path(url)
+        return cache_path is not None and os.path.exists(cache_path)
+    
+    def _load_cached_result(self, url: str) -> Optional[Dict[str, Any]]:
+        """Load the cached entry for this URL, or None on a miss."""
+        cache_path = self._cache_path(url)
+        if cache_path is None:
+            return None
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            cached['result']['url'] = url
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Ignoring unreadable cache entry {cache_path}: {e}")
+            return None
+        return cached
+    
+    def _replay_cached_result(self, cached: Dict[str, Any], progress_callback=None,
+                              sink: Optional[TextIO] = None) -> Dict[str, Any]:
+        """Feed cached segments to the callback and sink as a fresh run would."""
+        print("Using cached transcription")
+        self.video_info = cached['result'].get('video_info', {})
+        if progress_callback:
+            progress_callback("Using cached transcription...")
+        for segment in cached.get('segments', []):
+            if sink is not None:
+                sink.write(segment['text'] + " ")
+            if progress_callback:
+                progress_callback(segment)
+        return cached['result']
+    
+    def _store_cached_result(self, url: str, result: Dict[str, Any], segments: list):
+        """Atomically write a successful result and its segments to the cache."""
+        cache_path = self._cache_path(url)
+        if cache_path is None:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'result': result, 'segments': segments}, f)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"Error caching transcription: {e}")
     
     def _download_audio(self, url: str) -> Optional[str]:
         """Download audio from YouTube video."""
         # Store video info for later use
-        self.video_info = {}
+        audio_path, self.video_info = self.download_audio(url)
+        return audio_path
+    
+    def download_audio(self, url: str) -> Tuple[Optional[str], Dict[str, Any]]:
+        """
+        Download audio from YouTube video without touching per-job state,
+        so several downloads can run in parallel threads.
+        
+        Returns:
+            Tuple of (audio file path or None on failure, video info)
+        """
+        job_dir = tempfile.mkdtemp(dir=self.download_dir)
+        outtmpl = os.path.join(job_dir, '%(id)s.%(ext)s')
         
         # Try multiple approaches to download the audio
         approaches = [
-            # Approach 1: Standard with headers
+            # Approach 1: Standard with headers, audio-only in a codec the transcriber reads directly
             {
-                'format': 'bestaudio/best',
-                'outtmpl': '%(title)s.%(ext)s',
-                'postprocessors': [{
-                    'key': 'FFmpegExtractAudio',
-                    'preferredcodec': 'mp3',
-                    'preferredquality': '192',
-                }],
+                'format': 'bestaudio[ext=m4a]/bestaudio[ext=webm]/bestaudio',
+                'outtmpl': outtmpl,
                 'http_headers': {
                     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
                     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
@@ -141,7 +414,7 @@ class YouTubeTranscriber:
             # Approach 2: Different format and no postprocessing
             {
                 'format': 'worstaudio/worst',
-                'outtmpl': '%(title)s.%(ext)s',
+                'outtmpl': outtmpl,
                 'http_headers': {
                     'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
                 },
@@ -150,38 +423,43 @@ class YouTubeTranscriber:
             # Approach 3: Minimal options
             {
                 'format': 'bestaudio',
-                'outtmpl': '%(title)s.%(ext)s',
+                'outtmpl': outtmpl,
                 'retries': 2,
             }
         ]
         
+        # Extract video info once; retries below only redo format selection and download
+        try:
+            with yt_dlp.YoutubeDL({'quiet': True}) as ydl:
+                info = ydl.extract_info(url, download=False)
+        except Exception as e:
+            print(f"Failed to extract video info: {e}")
+            shutil.rmtree(job_dir, ignore_errors=True)
+            return None, {}
+        
+        video_info = {
+            'title': info.get('title', 'Unknown'),
+            'duration': info.get('duration', 0),
+            'thumbnail': info.get('thumbnail', ''),
+            'uploader': info.get('uploader', 'Unknown'),
+            'view_count': info.get('view_count', 0),
+            'upload_date': info.get('upload_date', ''),
+            'description': info.get('description', '')[:200] + '...' if info.get('description') else ''
+        }
+        
         for i, ydl_opts in enumerate(approaches, 1):
             try:
                 print(f"Trying download approach {i}...")
                 with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    info = ydl.extract_info(url, download=True)
-                    audio_path = ydl.prepare_filename(info)
-                    
-                    # Store video info
-                    self.video_info = {
-                        'title': info.get('title', 'Unknown'),
-                        'duration': info.get('duration', 0),
-                        'thumbnail': info.get('thumbnail', ''),
-                        'uploader': info.get('uploader', 'Unknown'),
-                        'view_count': info.get('view_count', 0),
-                        'upload_date': info.get('upload_date', ''),
-                        'description': info.get('description', '')[:200] + '...' if info.get('description') else ''
-                    }
-                    
-                    # If we used postprocessors, the file will be mp3
-                    if 'postprocessors' in ydl_opts:
-                        audio_path = os.path.splitext(audio_path)[0] + '.mp3'
+                    # process_ie_result mutates the info dict, so give each attempt its own copy
+                    result = ydl.process_ie_result(copy.deepcopy(info), download=True)
+                    audio_path = ydl.prepare_filename(result)
                     
                     # Check if file exists
                     if os.path.exists(audio_path):
                         print(f"Successfully downloaded with approach {i}")
                         self.temp_files.append(audio_path)
-                        return audio_path
+                        return audio_path, video_info
                     else:
                         print(f"File not found after approach {i}")
                         
@@ -190,167 +468,249 @@ class YouTubeTranscriber:
                 continue
         
         print("All download approaches failed")
-        return None
+        shutil.rmtree(job_dir, ignore_errors=True)
+        return None, video_info
     
-    def _convert_to_wav(self, audio_path: str) -> Optional[str]:
-        """Convert audio file to WAV format."""
+    def _load_audio(self, audio_path: str) -> Union[np.ndarray, str]:
+        """Decode audio to 16 kHz mono samples, falling back to the file path on failure."""
         try:
-            # Check file size first
-            file_size = os.path.getsize(audio_path)
-            max_size = 4 * 1024 * 1024 * 1024  # 4GB
-            
-            if file_size > max_size:
-                print(f"File too large ({file_size / (1024**3):.2f}GB). Using direct transcription.")
-                # For large files, try to transcribe directly without conversion
-                return audio_path
-            
-            # Determine file format from extension
-            file_ext = os.path.splitext(audio_path)[1].lower()
-            
-            # Load audio file based on format
-            if file_ext == '.mp3':
-                audio = AudioSegment.from_mp3(audio_path)
-            elif file_ext == '.m4a':
-                audio = AudioSegment.from_file(audio_path, format='m4a')
-            elif file_ext == '.webm':
-                audio = AudioSegment.from_file(audio_path, format='webm')
-            elif file_ext == '.ogg':
-                audio = AudioSegment.from_file(audio_path, format='ogg')
-            else:
-                # Try to auto-detect format
-                audio = AudioSegment.from_file(audio_path)
-            
-            # Create temporary WAV file
-            wav_path = tempfile.mktemp(suffix='.wav')
-            audio.export(wav_path, format='wav')
-            
-            self.temp_files.append(wav_path)
-            return wav_path
-            
+            return load_audio(audio_path)
         except Exception as e:
-            print(f"Error converting audio: {e}")
-            # If conversion fails, try to use the original file
+            print(f"Error decoding audio: {e}")
+            # If decoding fails, let the transcriber try the original file
             print("Attempting to transcribe original file directly...")
             return audio_path
     
-    def _transcribe_audio(self, audio_path: str, progress_callback=None) -> Optional[str]:
-        """Transcribe audio using Whisper locally with streaming support."""
+    def _transcribe_audio(self, audio: Union[np.ndarray, str], progress_callback=None,
+                          sink: Optional[TextIO] = None,
+                          beam_size: Optional[int] = None,
+                          model_size: Optional[str] = None,
+                          duration: Optional[float] = None,
+                          raise_errors: bool = False) -> Optional[str]:
+        """
+        Transcribe audio samples (or an audio file) using faster-whisper with streaming support.
+        
+        model_size switches the model first if given; the model is held for the whole call,
+        so concurrent callers asking for other sizes wait instead of swapping it out.
+        duration is only used when audio is a file path (default: from self.video_info).
+        Errors are printed and None is returned, unless raise_errors is set, in which case
+        None only means no speech was found.
+        """
+        if beam_size is None:
+            beam_size = self.beam_size
         try:
-            # Load Whisper model only if not already loaded or model size changed
-            if self.whisper_model is None:
-                print(f"Loading Whisper model '{self.model_size}'...")
-                if progress_callback:
-                    progress_callback(f"Loading Whisper model '{self.model_size}'...")
-                self.whisper_model = whisper.load_model(self.model_size)
-                print(f"Whisper model '{self.model_size}' loaded successfully")
-            else:
-                print(f"Using cached Whisper model '{self.model_size}'")
-            
-            print("Starting transcription with Whisper...")
+            # Long recordings on CPU are split on silences and spread over worker processes
+            if isinstance(audio, np.ndarray):
+                duration = len(audio) / SAMPLE_RATE
+            elif duration is None:
+                duration = getattr(self, 'video_info', {}).get('duration') or 0
+            workers = self._chunk_workers()
+            with self._model_cv:
+                # Chunk only when no other job is using the model, so the CPU is not oversubscribed
+                busy = self._model_users > 0
+            parallel = duration > LONG_AUDIO_SECONDS and workers > 1 and not busy
             
-            # Send initial progress
-            if progress_callback:
-                progress_callback("Processing audio with Whisper...")
+            with self.use_model(model_size, progress_callback, load=not parallel) as model:
+                if parallel:
+                    segments = self._iter_segments_parallel(audio, beam_size, workers, progress_callback)
+                else:
+                    segments = self._iter_segments(model, audio, beam_size, progress_callback)
+                full_transcription = self._collect_segments(segments, progress_callback, sink)
             
-            # Transcribe the audio with timestamps for streaming
-            result = self.whisper_model.transcribe(
-                audio_path,
-                language="en",  # Specify language for better accuracy
-                fp16=False,     # Use CPU for compatibility
-                verbose=True,   # Show progress
-                word_timestamps=True  # Get word-level timestamps for streaming
-            )
+            transcription = full_transcription.strip()
             
-            # Process segments for streaming
-            if "segments" in result and result["segments"]:
-                full_transcription = ""
-                total_segments = len(result["segments"])
-                
-                # Send progress update
-                if progress_callback:
-                    progress_callback(f"Found {total_segments} segments, streaming...")
-                
-                # Send segments immediately as they're available
-                for i, segment in enumerate(result["segments"]):
-                    segment_text = segment["text"].strip()
-                    if segment_text:
-                        full_transcription += segment_text + " "
-                        
-                        # Send segment immediately via progress callback
-                        if progress_callback:
-                            segment_message = {
-                                "type": "transcription_segment",
-                                "text": segment_text,
-                                "start": segment["start"],
-                                "end": segment["end"],
-                                "segment_number": i + 1,
-                                "total_segments": total_segments
-                            }
-                            print(f"[DEBUG] Sending transcription segment: {segment_message}")
-                            progress_callback(segment_message)
-                
-                transcription = full_transcription.strip()
-                
-                if transcription:
-                    print("Transcription completed successfully")
-                    return transcription
-                else:
-                    print("Whisper returned empty transcription")
-                    return None
+            if transcription:
+                print("Transcription completed successfully")
+                return transcription
             else:
-                # Fallback to simple transcription
-                transcription = result["text"].strip()
-                if transcription:
-                    print("Transcription completed successfully")
-                    return transcription
-                else:
-                    print("Whisper returned empty transcription")
-                    return None
+                print("Whisper returned empty transcription")
+                return None
                 
         except Exception as e:
             print(f"Whisper transcription error: {e}")
+            if raise_errors:
+                raise
             return None
     
+    def _collect_segments(self, segments: Iterable[Tuple[str, float, float]], progress_callback=None,
+                          sink: Optional[TextIO] = None) -> str:
+        """Stream each segment to the sink and callback, returning the joined text."""
+        full_transcription = ""
+        for i, (segment_text, start, end) in enumerate(segments):
+            segment_text = segment_text.strip()
+            if segment_text:
+                full_transcription += segment_text + " "
+                if sink is not None:
+                    sink.write(segment_text + " ")
+                
+                # Send segment immediately via progress callback
+                if progress_callback:
+                    segment_message = {
+                        "type": "transcription_segment",
+                        "text": segment_text,
+                        "start": start,
+                        "end": end,
+                        "segment_number": i + 1
+                    }
+                    logger.debug("Sending transcription segment: %s", segment_message)
+                    progress_callback(segment_message)
+        return full_transcription
+    
+    @contextlib.contextmanager
+    def use_model(self, model_size: Optional[str] = None, progress_callback=None,
+                  load: bool = True) -> Iterator[Optional[WhisperModel]]:
+        """
+        Hold the Whisper model for one job, switching to model_size first if given.
+        
+        A switch waits until no job is using the current model, and loading happens
+        under the same lock, so each model is loaded once and only one is resident.
+        While a switch is queued, jobs for any other size (including the current one)
+        wait behind it, so a steady stream of them cannot starve the switch.
+        With load=False the size is held without loading the in-process model
+        (chunked transcription loads its own copy in each worker) and None is yielded.
+        """
+        with self._model_cv:
+            if model_size is not None:
+                if model_size not in self.get_available_models():
+                    raise ValueError(f"Invalid model size. Available: {self.get_available_models()}")
+                # Queue behind a switch to another size rather than keep the current model busy
+                self._model_cv.wait_for(
+                    lambda: self._pending_size is None or self._pending_size == model_size
+                )
+            if model_size is not None and model_size != self.model_size:
+                # The first job asking for this size owns the pending switch
+                owner = self._pending_size is None
+                if owner:
+                    self._pending_size = model_size
+                try:
+                    self._model_cv.wait_for(
+                        lambda: self._model_users == 0 or self.model_size == model_size
+                    )
+                    if self.model_size != model_size:
+                        self.change_model(model_size)
+                finally:
+                    if owner:
+                        self._pending_size = None
+                        self._model_cv.notify_all()
+            
+            if load and self.whisper_model is None:
+                print(f"Loading Whisper model '{self.model_size}' on {self.device} ({self.compute_type})...")
+                if progress_callback:
+                    progress_callback(f"Loading Whisper model '{self.model_size}'...")
+                self.whisper_model = WhisperModel(
+                    self.model_size,
+                    device=self.device,
+                    compute_type=self.compute_type,
+                    cpu_threads=self.cpu_threads,
+                    num_workers=1
+                )
+                print(f"Whisper model '{self.model_size}' loaded successfully")
+            elif load:
+                print(f"Using cached Whisper model '{self.model_size}'")
+            
+            model = self.whisper_model if load else None
+            self._model_users += 1
+        try:
+            yield model
+        finally:
+            with self._model_cv:
+                self._model_users -= 1
+                self._model_cv.notify_all()
+    
+    def _iter_segments(self, model: WhisperModel, audio: Union[np.ndarray, str], beam_size: int,
+                       progress_callback=None) -> Iterator[Tuple[str, float, float]]:
+        """Yield (text, start, end) for each segment using the in-process model."""
+        print("Starting transcription with Whisper...")
+        
+        # Send initial progress
+        if progress_callback:
+            progress_callback("Processing audio with Whisper...")
+        
+        # Segments are produced lazily, so each one can be streamed as soon as it is decoded
+        segments, info = model.transcribe(audio, **_transcribe_options(beam_size))
+        for segment in segments:
+            yield segment.text, segment.start, segment.end
+    
+    def _chunk_workers(self) -> int:
+        """Number of worker processes to use for long audio (1 disables chunking)."""
+        if self.parallel_workers is not None:
+            return self.parallel_workers
+        if self.device == "cuda":
+            return 1
+        return max(1, self.cpu_threads // CHUNK_WORKER_THREADS)
+    
+    def _iter_segments_parallel(self, audio: Union[np.ndarray, str], beam_size: int, workers: int,
+                                progress_callback=None) -> Iterator[Tuple[str, float, float]]:
+        """Yield (text, start, end) for each segment, transcribing silence-aligned chunks in parallel."""
+        if not isinstance(audio, np.ndarray):
+            audio = decode_audio(audio, sampling_rate=SAMPLE_RATE)
+        chunks = _split_on_silence(audio)
+        
+        print(f"Transcribing {len(chunks)} chunks with {workers} workers...")
+        if progress_callback:
+            progress_callback(f"Transcribing {len(chunks)} chunks with {workers} workers...")
+        
+        # Results come back in chunk order
+        pool = self._get_chunk_pool(workers)
+        try:
+            results = pool.map(
+                _transcribe_chunk,
+                [audio[start:end] for start, end in chunks],
+                [start / SAMPLE_RATE for start, _ in chunks],
+                [beam_size] * len(chunks)
+            )
+            for chunk_segments in results:
+                yield from chunk_segments
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool on the next job
+            self._shutdown_chunk_pool()
+            raise
+    
+    def _get_chunk_pool(self, workers: int) -> ProcessPoolExecutor:
+        """Return the chunk worker pool for the current model, starting it on first use."""
+        with self._chunk_pool_lock:
+            if self._chunk_pool is None:
+                # Spawned workers each load their own model once and keep it between jobs
+                threads = max(1, self.cpu_threads // workers)
+                self._chunk_pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_chunk_worker,
+                    initargs=(self.model_size, self.device, self.compute_type, threads)
+                )
+            return self._chunk_pool
+    
+    def _shutdown_chunk_pool(self):
+        """Stop the chunk worker pool, releasing the models its workers hold."""
+        with self._chunk_pool_lock:
+            pool, self._chunk_pool = self._chunk_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+    
     def _cleanup_temp_files(self, files: Optional[list] = None):
         """Clean up temporary files."""
         files_to_clean = files if files is not None else self.temp_files
         
         for file_path in files_to_clean:
             try:
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-                    print(f"Cleaned up: {file_path}")
-            except Exception as e:
+                os.unlink(file_path)
+                print(f"Cleaned up: {file_path}")
+            except FileNotFoundError:
+                pass
+            except OSError as e:
                 print(f"Error cleaning up {file_path}: {e}")
+            # Drop the download's own directory along with it
+            job_dir = os.path.dirname(file_path)
+            if os.path.dirname(job_dir) == self.download_dir:
+                shutil.rmtree(job_dir, ignore_errors=True)
         
         # Clear the temp files list
         if files is None:
             self.temp_files.clear()
     
-    def save_transcription(self, transcription: str, file_path: str) -> bool:
-        """
-        Save transcription to a file.
-        
-        Args:
-            transcription: The transcription text
-            file_path: Path where to save the file
-            
-        Returns:
-            True if successful, False otherwise
-        """
-        try:
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(transcription)
-            
-            print(f"Transcription saved to: {file_path}")
-            return True
-            
-        except Exception as e:
-            print(f"Error saving transcription: {e}")
-            return False
+    def save_transcription(self, segments_iter: Union[str, Iterable[str]], file_path: str) -> bool:
+        """Save transcription to a file; see the module-level save_transcription."""
+        return save_transcription(segments_iter, file_path)
     
     def get_available_models(self) -> list:
         """Get list of available Whisper model sizes."""
@@ -361,6 +721,7 @@ class YouTubeTranscriber:
         if model_size in self.get_available_models():
             self.model_size = model_size
             self.whisper_model = None  # Will be reloaded on next use
+            self._shutdown_chunk_pool()  # Its workers hold the old model
             print(f"Model changed to: {model_size}")
         else:
             raise ValueError(f"Invalid model size. Available: {self.get_available_models()}")
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Persistent transcription worker.
+Keeps a single YouTubeTranscriber (and its loaded Whisper model) in memory
+so CLI/GUI clients do not pay the model load on every run.
+"""
+
+import os
+import threading
+from fastapi import FastAPI, HTTPException
+from transcriber_core import YouTubeTranscriber
+
+app = FastAPI(title="YouTube Transcriber Worker", version="1.0.0")
+
+# Single transcriber instance shared by all requests
+transcriber = YouTubeTranscriber()
+
+# The model is not thread-safe, so jobs are run one at a time
+transcribe_lock = threading.Lock()
+
+
+@app.post("/transcribe")
+def transcribe(data: dict):
+    """Transcribe a YouTube URL with the resident model"""
+    url = data.get("url")
+    model_size = data.get("model", transcriber.model_size)
+    
+    if not url:
+        raise HTTPException(status_code=400, detail="No URL provided")
+    if model_size not in transcriber.get_available_models():
+        raise HTTPException(status_code=400, detail=f"Invalid model size: {model_size}")
+    
+    with transcribe_lock:
+        if transcriber.model_size != model_size:
+            transcriber.change_model(model_size)
+        return transcriber.transcribe_youtube_url(url)
+
+
+if __name__ == "__main__":
+    import uvicorn
+    
+    port = int(os.getenv("TRANSCRIBER_SERVER_PORT", "8082"))
+    
+    print("Starting YouTube Transcriber worker...")
+    print(f"Available at: http://localhost:{port}")
+    
+    uvicorn.run(app, host="0.0.0.0", port=port)
@@ -1,26 +1,171 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import HTMLResponse, StreamingResponse
+from fastapi.responses import FileResponse, HTMLResponse, ORJSONResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from fastapi import Request
 import os
-import json
+import pathlib
+import sys
 import asyncio
-import threading
+import logging
+import orjson
+import atexit
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from transcriber_core import YouTubeTranscriber
 
-app = FastAPI(title="YouTube Transcriber", version="1.0.0")
+# Serving event loop, captured at startup; worker threads schedule queue puts onto it
+MAIN_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+def init_loop_state():
+    """Capture the serving loop and create the loop-bound admission condition, once"""
+    global MAIN_LOOP, admission_cv
+    if MAIN_LOOP is None:
+        MAIN_LOOP = asyncio.get_running_loop()
+        admission_cv = asyncio.Condition()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_loop_state()
+    yield
+
+app = FastAPI(title="YouTube Transcriber", version="1.0.0", lifespan=lifespan,
+              default_response_class=ORJSONResponse)
+
+# Debug output is skipped entirely unless LOGLEVEL=DEBUG
+LOGLEVEL = os.getenv("LOGLEVEL", "INFO").upper()
+log = logging.getLogger("transcriber")
+log.setLevel(LOGLEVEL)
 
 # Templates
 templates = Jinja2Templates(directory="templates")
 
+# Saved transcriptions; created at import so it also exists under `uvicorn web_app:app`
+TRANSCRIPTIONS_DIR = pathlib.Path("transcriptions")
+TRANSCRIPTIONS_DIR.mkdir(exist_ok=True)
+
+def transcription_path(filename: str) -> str:
+    """Resolve a client-supplied filename inside TRANSCRIPTIONS_DIR, rejecting traversal"""
+    if not filename or ".." in filename or "/" in filename or "\\" in filename:
+        raise HTTPException(status_code=400, detail="Invalid filename")
+    return str(TRANSCRIPTIONS_DIR / filename)
+
 # Global transcriber instance
 transcriber = YouTubeTranscriber()
 
-# Store active SSE streams and transcription status
+# Bounded pool for transcription jobs. Threads share the one in-process model,
+# whereas each process-pool worker would need its own copy of the weights.
+EXECUTOR = ThreadPoolExecutor(max_workers=int(os.getenv("TRANSCRIBE_WORKERS", "2")))
+atexit.register(EXECUTOR.shutdown, wait=False)
+
+# Admission control: requests beyond MAX_ACTIVE_TRANSCRIPTIONS wait for a free slot,
+# and get a 503 if none frees up within ADMISSION_TIMEOUT seconds
+MAX_ACTIVE_TRANSCRIPTIONS = int(os.getenv("TRANSCRIBE_MAX_ACTIVE", os.getenv("TRANSCRIBE_WORKERS", "2")))
+ADMISSION_TIMEOUT = float(os.getenv("TRANSCRIBE_ADMISSION_TIMEOUT", "30"))
+admission_cv: Optional[asyncio.Condition] = None  # Created on the serving loop at startup
+active_transcriptions = 0
+
+# Store active SSE streams
 active_sse_streams: Dict[str, asyncio.Queue] = {}
-transcription_status: Dict[str, bool] = {}
+# Seconds a finished job's queue waits for its client to open the stream before it is dropped
+UNCLAIMED_QUEUE_TTL = 300.0
+
+def expire_unclaimed_queue(client_id: str, queue: asyncio.Queue):
+    """Drop a finished job's queue if no stream has claimed it"""
+    if active_sse_streams.get(client_id) is queue:
+        del active_sse_streams[client_id]
+        log.debug("Dropped unclaimed SSE queue for client %s", client_id)
+
+# Server-generated client ids for requests that do not supply one
+_cid_counter = itertools.count()
+
+def _gen_cid() -> str:
+    return f"{time.monotonic_ns():x}{next(_cid_counter):x}"
+
+# Per-client queues are bounded; when a slow client falls behind, the oldest
+# progress messages are dropped. Messages of these types are never dropped.
+SSE_QUEUE_SIZE = 256
+UNDROPPABLE_MESSAGE_TYPES = ("transcription_complete", "error", "video_info")
+# How long an undroppable message waits on a queue holding nothing else,
+# so a job whose client has gone away does not block forever
+UNDROPPABLE_PUT_TIMEOUT = 30.0
+
+# Bursts of queued messages are sent as one SSE event carrying a JSON array.
+# Consecutive messages of a coalesced type collapse to the latest one, and a
+# terminal message always closes the batch.
+COALESCED_MESSAGE_TYPES = ("status", "progress")
+TERMINAL_MESSAGE_TYPES = ("transcription_complete", "error")
+
+# Comment line that keeps idle connections open without dispatching an event
+SSE_KEEPALIVE = b": keepalive\n\n"
+
+def encode_sse(message: dict) -> bytes:
+    """Frame a message as a complete SSE event, as one bytes object"""
+    return b"".join((b"data: ", orjson.dumps(message), b"\n\n"))
+
+def encode_sse_batch(payloads: List[bytes]) -> bytes:
+    """Frame already-encoded JSON messages as one SSE event holding a JSON array.
+    
+    The event is built as a single bytes object so it goes out as one HTTP chunk.
+    """
+    return b"".join((b"data: [", b",".join(payloads), b"]\n\n"))
+
+async def read_json(request: Request) -> dict:
+    """Parse a JSON request body with orjson"""
+    try:
+        data = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Invalid JSON body")
+    if not isinstance(data, dict):
+        raise HTTPException(status_code=400, detail="Expected a JSON object")
+    return data
+
+def sse_item(message: dict) -> Tuple[str, bytes]:
+    """Encode a message once, on the producer side, as a (type, JSON bytes) queue item"""
+    return message.get("type"), orjson.dumps(message)
+
+def evict_oldest_droppable(queue: asyncio.Queue) -> bool:
+    """Remove the oldest droppable item, keeping the rest in order. Returns False if there is none."""
+    kept = []
+    evicted = False
+    while not queue.empty():
+        item = queue.get_nowait()
+        if not evicted and item[0] not in UNDROPPABLE_MESSAGE_TYPES:
+            evicted = True
+        else:
+            kept.append(item)
+    for item in kept:
+        queue.put_nowait(item)
+    return evicted
+
+async def put_drop_oldest(queue: asyncio.Queue, item: Tuple[str, bytes]):
+    """Put an item on a client queue, evicting the oldest droppable entry if it is full"""
+    try:
+        queue.put_nowait(item)
+        return
+    except asyncio.QueueFull:
+        pass
+    
+    if evict_oldest_droppable(queue):
+        queue.put_nowait(item)
+    elif item[0] in UNDROPPABLE_MESSAGE_TYPES:
+        # Only undroppable messages are queued; wait for the client to catch up, but not forever
+        try:
+            await asyncio.wait_for(queue.put(item), timeout=UNDROPPABLE_PUT_TIMEOUT)
+        except asyncio.TimeoutError:
+            log.warning("Dropping %s message for a client that stopped reading", item[0])
+
+# Fixed-content messages, encoded once at import time
+SSE_START = sse_item({"type": "status", "message": "Starting transcription..."})
+SSE_DOWNLOADING = sse_item({"type": "status", "message": "Downloading audio..."})
+SSE_PROCESSING = sse_item({"type": "status", "message": "Processing audio..."})
+SSE_ERR_DOWNLOAD = sse_item({"type": "error", "message": "Failed to download audio"})
+SSE_ERR_NO_SPEECH = sse_item({"type": "error", "message": "No speech detected in the audio"})
+SSE_ERR_INTERNAL = sse_item({"type": "error", "message": "Internal error during transcription"})
+
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
@@ -29,12 +174,12 @@ async def index(request: Request):
 async def stream_transcription(client_id: str):
     """Server-Sent Events endpoint for streaming transcription"""
     async def event_generator():
-        print(f"[DEBUG] SSE stream started for client {client_id}")
+        log.debug("SSE stream started for client %s", client_id)
         if client_id not in active_sse_streams:
-            print(f"[DEBUG] Creating new SSE queue for client {client_id} (should not happen)")
-            active_sse_streams[client_id] = asyncio.Queue()
+            log.debug("Creating new SSE queue for client %s (should not happen)", client_id)
+            active_sse_streams[client_id] = asyncio.Queue(maxsize=SSE_QUEUE_SIZE)
         else:
-            print(f"[DEBUG] Using existing SSE queue for client {client_id}")
+            log.debug("Using existing SSE queue for client %s", client_id)
         
         queue = active_sse_streams[client_id]
         
@@ -42,35 +187,48 @@ async def stream_transcription(client_id: str):
             while True:
                 try:
                     # Wait for message with timeout (increased for transcription processing)
-                    print(f"[DEBUG] Waiting for message from queue for client {client_id}")
-                    message = await asyncio.wait_for(queue.get(), timeout=120.0)
-                    print(f"[DEBUG] Received message for client {client_id}: {message}")
+                    log.debug("Waiting for message from queue for client %s", client_id)
+                    message_type, payload = await asyncio.wait_for(queue.get(), timeout=120.0)
+                    batch = [(message_type, payload)]
+                    
+                    # Fold anything else already queued into the same event
+                    while message_type not in TERMINAL_MESSAGE_TYPES:
+                        try:
+                            message_type, payload = queue.get_nowait()
+                        except asyncio.QueueEmpty:
+                            break
+                        if message_type in COALESCED_MESSAGE_TYPES and batch[-1][0] == message_type:
+                            batch[-1] = (message_type, payload)
+                        else:
+                            batch.append((message_type, payload))
                     
-                    # Format SSE message
-                    sse_message = f"data: {json.dumps(message)}\n\n"
-                    print(f"[DEBUG] Sending SSE message to client {client_id}: {sse_message.strip()}")
-                    yield sse_message
+                    log.debug("Sending %s SSE messages to client %s", len(batch), client_id)
+                    yield encode_sse_batch([item_payload for _, item_payload in batch])
                     
-                    # If it's a completion message, break
-                    if message.get("type") == "transcription_complete":
-                        print(f"[DEBUG] Transcription complete, ending stream for client {client_id}")
+                    # Nothing follows a completion or error message, so end the response
+                    if message_type in TERMINAL_MESSAGE_TYPES:
+                        log.debug("Transcription finished (%s), ending stream for client %s", message_type, client_id)
                         break
                         
                 except asyncio.TimeoutError:
-                    # Send keepalive
-                    keepalive_message = {'type': 'keepalive', 'timestamp': datetime.now().isoformat()}
-                    sse_message = f"data: {json.dumps(keepalive_message)}\n\n"
-                    print(f"[DEBUG] Sending keepalive to client {client_id}")
-                    yield sse_message
+                    # Send keepalive as an SSE comment, which EventSource ignores
+                    log.debug("Sending keepalive to client %s", client_id)
+                    yield SSE_KEEPALIVE
                     
+        except asyncio.CancelledError:
+            # Client went away; let cancellation reach the server untouched
+            raise
+        except (ConnectionResetError, BrokenPipeError):
+            log.debug("Client %s disconnected", client_id)
         except Exception as e:
-            print(f"[DEBUG] Error in SSE stream for client {client_id}: {e}")
+            log.error("Error in SSE stream for client %s: %s", client_id, e)
             error_message = {'type': 'error', 'message': str(e)}
-            yield f"data: {json.dumps(error_message)}\n\n"
+            yield encode_sse(error_message)
         finally:
-            # Clean up - but only if the transcription is actually complete
-            # Don't clean up on timeout or client disconnect, let the transcription thread finish
-            print(f"[DEBUG] SSE stream ending for client {client_id}, but keeping queue for transcription thread")
+            # The transcription thread holds its own reference to the queue,
+            # so it can keep running if the client goes away
+            active_sse_streams.pop(client_id, None)
+            log.debug("SSE stream ending for client %s, removed its queue", client_id)
     
     return StreamingResponse(
         event_generator(),
@@ -79,7 +237,12 @@ async def stream_transcription(client_id: str):
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
             "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Headers": "Cache-Control"
+            "Access-Control-Allow-Headers": "Cache-Control",
+            # Stop proxies (nginx, Cloudflare) from buffering or compressing the stream
+            "X-Accel-Buffering": "no",
+            "Content-Encoding": "identity",
+            "Pragma": "no-cache",
+            "Keep-Alive": "timeout=120"
         }
     )
 
@@ -87,27 +250,37 @@ async def stream_transcription(client_id: str):
 async def start_transcription(request: Request):
     """Start transcription and return SSE stream URL"""
     try:
-        data = await request.json()
+        data = await read_json(request)
         url = data.get("url")
         model_size = data.get("model_size", "base")
-        client_id = data.get("client_id", str(datetime.now().timestamp()))
+        client_id = data.get("client_id") or _gen_cid()
         
         if not url:
             raise HTTPException(status_code=400, detail="No URL provided")
+        if model_size not in transcriber.get_available_models():
+            raise HTTPException(status_code=400, detail=f"Invalid model size: {model_size}")
+        
+        # Wait for a free transcription slot
+        if not await acquire_admission():
+            raise HTTPException(status_code=503, detail="Server busy, try again later")
         
         # Create SSE queue BEFORE starting transcription
         if client_id not in active_sse_streams:
-            active_sse_streams[client_id] = asyncio.Queue()
-            transcription_status[client_id] = True  # Mark transcription as active
-            print(f"[DEBUG] Created SSE queue for client {client_id} before starting transcription")
+            active_sse_streams[client_id] = asyncio.Queue(maxsize=SSE_QUEUE_SIZE)
+            log.debug("Created SSE queue for client %s before starting transcription", client_id)
         
-        # Start transcription in background thread
-        thread = threading.Thread(
-            target=run_transcription, 
-            args=(client_id, url, model_size)
+        # Queue transcription on the worker pool, releasing the slot when it finishes
+        try:
+            future = EXECUTOR.submit(run_transcription, client_id, url, model_size,
+                                     active_sse_streams[client_id])
+        except Exception as e:
+            # Only a started job releases its slot, so give it back here (e.g. after shutdown)
+            await release_admission()
+            active_sse_streams.pop(client_id, None)
+            raise HTTPException(status_code=503, detail=f"Could not start transcription: {e}")
+        future.add_done_callback(
+            lambda _: asyncio.run_coroutine_threadsafe(release_admission(), MAIN_LOOP)
         )
-        thread.daemon = True
-        thread.start()
         
         return {
             "success": True,
@@ -115,206 +288,167 @@ async def start_transcription(request: Request):
             "stream_url": f"/stream/{client_id}"
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-def run_transcription(client_id: str, url: str, model_size: str):
-    """Run transcription in background thread"""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+async def acquire_admission() -> bool:
+    """Take a transcription slot, waiting up to ADMISSION_TIMEOUT. Returns False if none freed up."""
+    global active_transcriptions
+    # Also covers servers that never ran the lifespan, e.g. when mounted as a sub-app
+    init_loop_state()
+    async with admission_cv:
+        try:
+            await asyncio.wait_for(
+                admission_cv.wait_for(lambda: active_transcriptions < MAX_ACTIVE_TRANSCRIPTIONS),
+                timeout=ADMISSION_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            return False
+        active_transcriptions += 1
+        return True
+
+async def release_admission():
+    """Free a transcription slot and wake one waiting request"""
+    global active_transcriptions
+    async with admission_cv:
+        active_transcriptions -= 1
+        admission_cv.notify(1)
+
+def run_transcription(client_id: str, url: str, model_size: str, queue: asyncio.Queue):
+    """Run transcription in background thread, publishing to the client's queue"""
+    def push(item: Tuple[str, bytes]):
+        # Enqueue an encoded item on the serving loop
+        try:
+            asyncio.run_coroutine_threadsafe(put_drop_oldest(queue, item), MAIN_LOOP)
+        except Exception as e:
+            log.error("Error sending %s message: %s", item[0], e)
     
-    try:
-        print(f"[DEBUG] Starting transcription for client {client_id}")
-        
-        # Update transcriber model if needed
-        if transcriber.model_size != model_size:
-            transcriber.change_model(model_size)
+    def send(message: dict):
+        # Encode here on the worker thread
+        try:
+            item = sse_item(message)
+        except TypeError as e:
+            # orjson.JSONEncodeError; a terminal message must still end the stream
+            log.error("Could not encode %s message: %s", message.get("type"), e)
+            if message.get("type") in TERMINAL_MESSAGE_TYPES:
+                push(SSE_ERR_INTERNAL)
+            return
+        push(item)
+    
+    def send_error(step: str, e: Exception):
+        log.error("%s failed for client %s: %s", step, client_id, e)
+        send({"type": "error", "message": str(e)})
+    
+    # Progress callback for real-time updates
+    def progress_callback(message):
+        log.debug("Progress callback called: %s - %s", type(message), message)
         
-        # Progress callback for real-time updates
-        def progress_callback(message):
-            try:
-                print(f"[DEBUG] Progress callback called: {type(message)} - {message}")
-                if client_id in active_sse_streams:
-                    queue = active_sse_streams[client_id]
-                    
-                    # Format message based on type
-                    if isinstance(message, dict):
-                        # Already formatted message (transcription segments)
-                        formatted_message = message
-                    elif isinstance(message, str):
-                        # Simple status message
-                        formatted_message = {"type": "status", "message": message}
-                    else:
-                        # Fallback for other types
-                        formatted_message = {"type": "status", "message": str(message)}
-                    
-                    asyncio.run_coroutine_threadsafe(
-                        queue.put(formatted_message),
-                        loop
-                    )
-                    print(f"[DEBUG] Message sent to SSE queue for client {client_id}")
-                else:
-                    print(f"[DEBUG] Client {client_id} not found in active_sse_streams")
-            except Exception as e:
-                print(f"[DEBUG] Error sending progress message: {e}")
+        # Format message based on type
+        if isinstance(message, dict):
+            # Already formatted message (transcription segments)
+            send(message)
+        else:
+            # Simple status message
+            send({"type": "status", "message": str(message)})
+    
+    try:
+        log.debug("Starting transcription for client %s", client_id)
         
         # Send start message
-        try:
-            if client_id in active_sse_streams:
-                queue = active_sse_streams[client_id]
-                start_message = {"type": "status", "message": "Starting transcription..."}
-                asyncio.run_coroutine_threadsafe(
-                    queue.put(start_message),
-                    loop
-                )
-                print(f"[DEBUG] Start message sent to client {client_id}")
-        except Exception as e:
-            print(f"[DEBUG] Error sending start message: {e}")
+        push(SSE_START)
+        log.debug("Start message sent to client %s", client_id)
         
         # Download audio first to get video info
-        print(f"[DEBUG] Starting audio download...")
-        progress_callback("Downloading audio...")
+        log.debug("Starting audio download...")
+        push(SSE_DOWNLOADING)
         
-        audio_path = transcriber._download_audio(url)
+        try:
+            # Video info stays local to this job; the transcriber's own attribute is shared
+            audio_path, video_info = transcriber.download_audio(url)
+        except Exception as e:
+            send_error("Download", e)
+            return
         if not audio_path:
-            print(f"[DEBUG] Audio download failed")
-            try:
-                if client_id in active_sse_streams:
-                    queue = active_sse_streams[client_id]
-                    asyncio.run_coroutine_threadsafe(
-                        queue.put({"type": "error", "message": "Failed to download audio"}),
-                        loop
-                    )
-            except Exception as e:
-                print(f"[DEBUG] Error sending download error: {e}")
+            log.debug("Audio download failed")
+            push(SSE_ERR_DOWNLOAD)
             return
         
-        print(f"[DEBUG] Audio downloaded successfully: {audio_path}")
+        log.debug("Audio downloaded successfully: %s", audio_path)
         
         # Send video info immediately after download
-        if hasattr(transcriber, 'video_info') and transcriber.video_info:
-            print(f"[DEBUG] Sending video info: {transcriber.video_info}")
-            try:
-                if client_id in active_sse_streams:
-                    queue = active_sse_streams[client_id]
-                    video_message = {"type": "video_info", "data": transcriber.video_info}
-                    asyncio.run_coroutine_threadsafe(
-                        queue.put(video_message),
-                        loop
-                    )
-                    print(f"[DEBUG] Video info sent to client {client_id}")
-                else:
-                    print(f"[DEBUG] Client {client_id} not found when trying to send video info")
-            except Exception as e:
-                print(f"[DEBUG] Error sending video info: {e}")
+        if video_info:
+            log.debug("Sending video info: %s", video_info)
+            send({"type": "video_info", "data": video_info})
         else:
-            print(f"[DEBUG] No video info available")
+            log.debug("No video info available")
         
-        # Process audio
-        print(f"[DEBUG] Starting audio processing...")
-        progress_callback("Processing audio...")
-        
-        processed_audio_path = transcriber._convert_to_wav(audio_path)
-        if not processed_audio_path:
-            print(f"[DEBUG] Audio processing failed")
+        try:
+            # Process audio; on a decode failure this falls back to the file path
+            log.debug("Starting audio processing...")
+            push(SSE_PROCESSING)
+            
+            audio = transcriber._load_audio(audio_path)
+            
+            log.debug("Audio processed successfully: %s", audio_path)
+            
+            # Run transcription
+            log.debug("Starting transcription...")
             try:
-                if client_id in active_sse_streams:
-                    queue = active_sse_streams[client_id]
-                    asyncio.run_coroutine_threadsafe(
-                        queue.put({"type": "error", "message": "Failed to process audio"}),
-                        loop
-                    )
+                # Switches to model_size and holds it until this job is done
+                result = transcriber._transcribe_audio(audio, progress_callback, model_size=model_size,
+                                                    duration=video_info.get('duration') or 0,
+                                                    raise_errors=True)
             except Exception as e:
-                print(f"[DEBUG] Error sending processing error: {e}")
-            return
-        
-        print(f"[DEBUG] Audio processed successfully: {processed_audio_path}")
-        
-        # Run transcription
-        print(f"[DEBUG] Starting transcription...")
-        result = transcriber._transcribe_audio(processed_audio_path, progress_callback)
+                send_error("Transcription", e)
+                return
+        finally:
+            transcriber._cleanup_temp_files([audio_path])
         
         if result:
-            print(f"[DEBUG] Transcription completed successfully")
+            log.debug("Transcription completed successfully")
             # Send final result
-            try:
-                if client_id in active_sse_streams:
-                    queue = active_sse_streams[client_id]
-                    completion_message = {"type": "transcription_complete", "data": {
-                        "success": True,
-                        "transcription": result,
-                        "url": url,
-                        "model_used": model_size,
-                        "video_info": getattr(transcriber, 'video_info', {})
-                    }}
-                    asyncio.run_coroutine_threadsafe(
-                        queue.put(completion_message),
-                        loop
-                    )
-                    print(f"[DEBUG] Completion message sent to client {client_id}")
-            except Exception as e:
-                print(f"[DEBUG] Error sending completion message: {e}")
+            send({"type": "transcription_complete", "data": {
+                "success": True,
+                "transcription": result,
+                "url": url,
+                "model_used": model_size,
+                "video_info": video_info
+            }})
         else:
-            print(f"[DEBUG] Transcription failed - no result")
-            # Send error
-            try:
-                if client_id in active_sse_streams:
-                    queue = active_sse_streams[client_id]
-                    asyncio.run_coroutine_threadsafe(
-                        queue.put({"type": "error", "message": "No speech detected in the audio"}),
-                        loop
-                    )
-            except Exception as e:
-                print(f"[DEBUG] Error sending error message: {e}")
-                
-    except Exception as e:
-        print(f"[DEBUG] Exception in transcription: {e}")
-        try:
-            if client_id in active_sse_streams:
-                queue = active_sse_streams[client_id]
-                asyncio.run_coroutine_threadsafe(
-                    queue.put({"type": "error", "message": str(e)}),
-                    loop
-                )
-        except Exception as e2:
-            print(f"[DEBUG] Error sending error message: {e2}")
+            log.debug("Transcription failed - no result")
+            push(SSE_ERR_NO_SPEECH)
+    
+    except Exception:
+        # Last resort, so every job still ends its client's stream
+        log.exception("Unexpected error in transcription for client %s", client_id)
+        push(SSE_ERR_INTERNAL)
     
     finally:
-        print(f"[DEBUG] Transcription thread ending for client {client_id}")
-        # Mark transcription as complete and clean up
-        transcription_status[client_id] = False
-        if client_id in active_sse_streams:
-            del active_sse_streams[client_id]
-            print(f"[DEBUG] Cleaned up SSE queue for client {client_id}")
-        if client_id in transcription_status:
-            del transcription_status[client_id]
-        
-        # Don't close the loop immediately, let pending tasks finish
-        try:
-            # Wait a bit for any pending coroutines to complete
-            pending = asyncio.all_tasks(loop)
-            if pending:
-                print(f"[DEBUG] Waiting for {len(pending)} pending tasks to complete")
-                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
-        except Exception as e:
-            print(f"[DEBUG] Error waiting for pending tasks: {e}")
-        finally:
-            loop.close()
+        log.debug("Transcription thread ending for client %s", client_id)
+        # The SSE stream removes the queue when it ends; expire it in case no stream ever attaches
+        MAIN_LOOP.call_soon_threadsafe(
+            MAIN_LOOP.call_later, UNCLAIMED_QUEUE_TTL, expire_unclaimed_queue, client_id, queue
+        )
 
 @app.post("/api/save-transcription")
 async def save_transcription(request: Request):
     """Save transcription to file"""
     try:
-        data = await request.json()
+        data = await read_json(request)
         transcription = data.get("transcription")
         filename = data.get("filename", f"transcription_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt")
         
         if not transcription:
             raise HTTPException(status_code=400, detail="No transcription to save")
         
-        filepath = os.path.join('transcriptions', filename)
+        filepath = transcription_path(filename)
         
-        if transcriber.save_transcription(transcription, filepath):
+        # Write on a worker thread so slow storage does not stall the SSE streams
+        if await asyncio.to_thread(transcriber.save_transcription, transcription, filepath):
+            # Overwriting a file does not change the directory mtime
+            _listing_cache["mtime"] = -1
             return {
                 "success": True,
                 "filename": filename,
@@ -323,6 +457,8 @@ async def save_transcription(request: Request):
         else:
             raise HTTPException(status_code=500, detail="Failed to save transcription")
             
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -334,48 +470,67 @@ async def get_models():
         "current_model": transcriber.model_size
     }
 
+# File extensions listed by /api/transcriptions
+TRANSCRIPTION_EXTENSIONS = ('.txt',)
+
+# Last transcriptions listing, reused while the directory mtime is unchanged
+_listing_cache = {"mtime": -1, "data": []}
+
 @app.get("/api/transcriptions")
 async def get_transcriptions():
     """Get list of saved transcriptions"""
-    transcriptions_dir = 'transcriptions'
-    if not os.path.exists(transcriptions_dir):
+    transcriptions_dir = TRANSCRIPTIONS_DIR
+    try:
+        dir_mtime = os.stat(transcriptions_dir).st_mtime
+    except FileNotFoundError:
         return []
     
-    files = []
-    for filename in os.listdir(transcriptions_dir):
-        if filename.endswith('.txt'):
-            filepath = os.path.join(transcriptions_dir, filename)
-            stat = os.stat(filepath)
-            files.append({
-                'filename': filename,
+    if dir_mtime == _listing_cache["mtime"]:
+        return _listing_cache["data"]
+    
+    # DirEntry caches its stat result and file type, so each file costs at most one syscall
+    with os.scandir(transcriptions_dir) as entries:
+        files = [
+            {
+                'filename': entry.name,
                 'size': stat.st_size,
                 'created': datetime.fromtimestamp(stat.st_ctime).isoformat(),
                 'modified': datetime.fromtimestamp(stat.st_mtime).isoformat()
-            })
+            }
+            for entry in entries
+            if entry.name.endswith(TRANSCRIPTION_EXTENSIONS) and entry.is_file()
+            for stat in (entry.stat(),)
+        ]
     
-    return sorted(files, key=lambda x: x['modified'], reverse=True)
+    files.sort(key=lambda x: x['modified'], reverse=True)
+    _listing_cache["mtime"] = dir_mtime
+    _listing_cache["data"] = files
+    return files
 
 @app.get("/api/transcriptions/{filename}")
 async def get_transcription(filename: str):
     """Get content of a specific transcription file"""
-    filepath = os.path.join('transcriptions', filename)
+    filepath = transcription_path(filename)
     if not os.path.exists(filepath):
         raise HTTPException(status_code=404, detail="File not found")
     
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-        return {"content": content}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    # Streamed from disk in chunks rather than read into memory
+    return FileResponse(filepath, media_type="text/plain; charset=utf-8")
 
 if __name__ == "__main__":
     import uvicorn
     
-    # Create necessary directories
-    os.makedirs('transcriptions', exist_ok=True)
+    logging.basicConfig(level=LOGLEVEL, format="[%(levelname)s] %(message)s")
     
     print("Starting YouTube Transcriber Web App...")
     print("Available at: http://localhost:8081")
     
-    uvicorn.run(app, host="0.0.0.0", port=8081) 
\ No newline at end of file
+    # C event loop and HTTP parser; uvloop is not available on Windows
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8081,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        log_level="warning"
+    )
\ No newline at end of file